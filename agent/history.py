@@ -30,25 +30,27 @@ class HistoryStore:
         lines = _message_to_history_lines(message)
         if not lines:
             return
-        with self.chat_path.open("a", encoding="utf-8") as f:
-            for line in lines:
-                f.write(line + "\n")
+        payload = "".join(line + "\n" for line in lines).encode("utf-8")
+        with self.chat_path.open("ab") as f:
+            f.write(payload)
 
     def append_nl_command(self, command: str) -> None:
         command = command.strip("\n")
         if not command:
             return
-        with self.nl_path.open("a", encoding="utf-8") as f:
-            f.write(command + "\n")
+        with self.nl_path.open("ab") as f:
+            f.write((command + "\n").encode("utf-8"))
 
     def load_chat_messages(self) -> List[Dict[str, Any]]:
         """Load chat messages from history as simple role/content pairs."""
         messages: List[Dict[str, Any]] = []
         raw_lines: List[str] = []
         canonical_lines: List[str] = []
-        if not self.chat_path.exists():
+        try:
+            f = self.chat_path.open("r", encoding="utf-8")
+        except FileNotFoundError:
             return messages
-        with self.chat_path.open("r", encoding="utf-8") as f:
+        with f:
             for line in f:
                 text = line.rstrip("\n")
                 if not text:
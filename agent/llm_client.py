@@ -19,7 +19,7 @@ class LLMResponse:
     finish_reason: str
 
 
-def _build_client(provider: ProviderConfig) -> AsyncOpenAI:
+def build_client(provider: ProviderConfig) -> AsyncOpenAI:
     api_key = os.getenv(provider.api_key_env)
     if not api_key:
         raise LLMClientError(f"Missing API key in environment variable {provider.api_key_env}")
@@ -30,8 +30,8 @@ async def complete_chat(
     messages: List[Dict[str, Any]],
     tools: List[Dict[str, Any]],
     provider: ProviderConfig,
+    client: AsyncOpenAI,
 ) -> LLMResponse:
-    client = _build_client(provider)
     try:
         response = await client.chat.completions.create(
             model=provider.model,
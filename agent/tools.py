@@ -116,6 +116,22 @@ TOOL_DEFINITIONS: List[Dict[str, Any]] = [
     },
 ]
 
+_IS_WINDOWS = os.name == "nt"
+
+# Commands containing any of these need a shell to interpret them.
+_SHELL_METACHARS = frozenset("|&;<>()$`\\\"'*?[]{}~#!\n\r")
+# sh separates words on blanks only; other whitespace (\f, \v, NBSP, ...) stays inside a word.
+_WORD_SEPARATORS = re.compile(r"[ \t]+")
+# Builtins and keywords that are missing or behave differently as standalone executables.
+_SHELL_BUILTINS = frozenset(
+    {
+        ".", ":", "alias", "bg", "break", "case", "cd", "chdir", "command", "continue", "echo", "eval",
+        "exec", "exit", "export", "false", "fg", "for", "function", "hash", "if", "jobs", "kill", "local",
+        "printf", "pwd", "read", "readonly", "return", "set", "shift", "source", "test", "time", "times",
+        "trap", "true", "type", "ulimit", "umask", "unalias", "unset", "until", "wait", "while",
+    }
+)
+
 _ACTIVE_CONFIG_PATH: Optional[Path] = None
 _ACTIVE_WORKDIR: Optional[Path] = None
 _INITIAL_WORKDIR: Optional[Path] = None
@@ -206,15 +222,41 @@ async def _replace_in_file(
     return f"Replaced {num} occurrence(s) in {target}"
 
 
+def _direct_argv(cmd: str) -> Optional[List[str]]:
+    """Return argv when ``cmd`` is a plain program invocation that needs no shell."""
+    if _IS_WINDOWS or any(ch in _SHELL_METACHARS for ch in cmd):
+        return None
+    argv = [word for word in _WORD_SEPARATORS.split(cmd) if word]
+    if not argv or argv[0] in _SHELL_BUILTINS or "=" in argv[0]:
+        return None
+    return argv
+
+
+async def _spawn(cmd: str, cwd: Optional[str]) -> asyncio.subprocess.Process:
+    argv = _direct_argv(cmd)
+    if argv is not None:
+        try:
+            return await asyncio.create_subprocess_exec(
+                *argv,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+            )
+        except OSError:
+            # Let the shell report missing or non-executable programs with its usual exit codes.
+            pass
+    return await asyncio.create_subprocess_shell(
+        cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+    )
+
+
 async def _run_cmd(cmd: str) -> str:
     try:
         cwd = str(_ACTIVE_WORKDIR) if _ACTIVE_WORKDIR else None
-        process = await asyncio.create_subprocess_shell(
-            cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=cwd,
-        )
+        process = await _spawn(cmd, cwd)
         try:
             stdout_bytes, stderr_bytes = await process.communicate()
         except asyncio.CancelledError:
@@ -277,8 +319,13 @@ def _extract_cd_target(cmd: str) -> Optional[str]:
     stripped = cmd.strip()
     if not stripped:
         return None
+    # Cheap prefix test so ordinary commands skip the full shlex parse. Quoting or escaping
+    # (\cd, c"d", 'cd') may still unquote to cd, so those fall through to shlex.
+    head = stripped[:8]
+    if not head.lower().startswith(("cd", "chdir")) and not any(ch in head for ch in "\\\"'"):
+        return None
     try:
-        tokens = shlex.split(stripped, posix=os.name != "nt")
+        tokens = shlex.split(stripped, posix=not _IS_WINDOWS)
     except ValueError:
         return None
     if not tokens:
@@ -287,7 +334,7 @@ def _extract_cd_target(cmd: str) -> Optional[str]:
     if head not in ("cd", "chdir"):
         return None
     idx = 1
-    if os.name == "nt" and idx < len(tokens) and tokens[idx].lower() == "/d":
+    if _IS_WINDOWS and idx < len(tokens) and tokens[idx].lower() == "/d":
         idx += 1
     if idx >= len(tokens):
         return ""
@@ -8,7 +8,11 @@ from rich.console import Console
 
 
 def build_console(use_rich: bool) -> Console:
-    return Console(file=sys.stderr, force_terminal=use_rich, stderr=True)
+    # Spinners and ANSI styling only help when a person is watching stderr.
+    # Off a TTY, leave the decision to Rich (None) so FORCE_COLOR/TTY_COMPATIBLE still apply.
+    interactive = use_rich and sys.stderr.isatty()
+    force_terminal = True if interactive else (None if use_rich else False)
+    return Console(file=sys.stderr, force_terminal=force_terminal, stderr=True)
 
 
 def status(console: Console, enabled: bool, message: str) -> ContextManager:
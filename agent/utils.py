@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import functools
+import os
+import stat
+import tempfile
 from enum import Enum
 from pathlib import Path
 from typing import Tuple
 
-ROOT = Path(__file__).resolve().parent.parent
-
 
 class BuiltinCommand(str, Enum):
     RESET_SESSION = "reset_session"
@@ -14,10 +16,29 @@ class BuiltinCommand(str, Enum):
     UPDATE_CONFIG = "update_config"
 
 
+_EXACT_BUILTIN_COMMANDS = {
+    "reset": BuiltinCommand.RESET_SESSION,
+    "/reset": BuiltinCommand.RESET_SESSION,
+    "reset_session": BuiltinCommand.RESET_SESSION,
+    "show_config": BuiltinCommand.SHOW_CONFIG,
+    "show_help": BuiltinCommand.SHOW_HELP,
+}
+_MAX_EXACT_BUILTIN_LEN = max(len(name) for name in _EXACT_BUILTIN_COMMANDS)
+_UPDATE_CONFIG_PREFIX = "update config"
+_RESET_TOKENS = frozenset(
+    name for name, command in _EXACT_BUILTIN_COMMANDS.items() if command is BuiltinCommand.RESET_SESSION
+)
+_RESET_TOKEN_LENGTHS = frozenset(len(token) for token in _RESET_TOKENS)
+
+
 def is_reset_command(text: str | None) -> bool:
     """Return True when the input requests a reset (/reset, reset, or reset_session)."""
-    cmd, _ = parse_builtin_command(text)
-    return cmd == BuiltinCommand.RESET_SESSION
+    if not text:
+        return False
+    normalized = text.strip()
+    if len(normalized) not in _RESET_TOKEN_LENGTHS:
+        return False
+    return normalized.lower() in _RESET_TOKENS
 
 
 def parse_builtin_command(text: str | None) -> tuple[BuiltinCommand | None, str]:
@@ -29,51 +50,101 @@ def parse_builtin_command(text: str | None) -> tuple[BuiltinCommand | None, str]
     if not text:
         return None, ""
     normalized = text.strip()
-    lowered = normalized.lower()
-
-    if lowered in ("reset", "/reset", "reset_session"):
-        return BuiltinCommand.RESET_SESSION, ""
-    if lowered == "show_config":
-        return BuiltinCommand.SHOW_CONFIG, ""
-    if lowered == "show_help":
-        return BuiltinCommand.SHOW_HELP, ""
-    if lowered.startswith("update config"):
-        payload = normalized[len("update config") :].strip()
+
+    # Only lowercase as much of the input as a builtin could possibly span.
+    if len(normalized) <= _MAX_EXACT_BUILTIN_LEN:
+        exact = _EXACT_BUILTIN_COMMANDS.get(normalized.lower())
+        if exact is not None:
+            return exact, ""
+    prefix_len = len(_UPDATE_CONFIG_PREFIX)
+    if normalized[:prefix_len].lower() == _UPDATE_CONFIG_PREFIX:
+        payload = normalized[prefix_len:].strip()
         return BuiltinCommand.UPDATE_CONFIG, payload
 
     return None, ""
 
 
-def _load_plugin_content(relative_path: Path, fallback: str) -> str:
+def _load_plugin_bytes(relative_path: Path, fallback: bytes) -> bytes:
     try:
-        return relative_path.read_text(encoding="utf-8")
+        return relative_path.read_bytes()
     except OSError:
         return fallback
 
 
-def _ensure_plugin(config_path: Path, filename: str, content: str) -> Tuple[Path, bool]:
+@functools.lru_cache(maxsize=16)
+def _plugin_dir(config_path: Path) -> Path:
+    return config_path.expanduser().resolve().parent
+
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def _replace_file(path: Path, content: bytes) -> None:
+    """Atomically replace the file at ``path`` (or its symlink target) with ``content``."""
+    # Swap in the link target like an in-place write would, keeping the user's symlink.
+    target = Path(os.path.realpath(path))
+    try:
+        mode = stat.S_IMODE(os.stat(target).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_current_umask()
+
+    # A unique sibling temp file keeps concurrent runs from sharing or renaming away each other's file.
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=target.name + ".")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(content)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+_O_RDONLY_BINARY = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+
+def _read_bytes_if_size(path: Path, size: int) -> bytes | None:
+    """Return the file bytes when its size equals ``size``; otherwise None."""
+    try:
+        fd = os.open(path, _O_RDONLY_BINARY)
+    except OSError:
+        return None
+    try:
+        # A size mismatch already proves the file is stale; skip reading it.
+        if os.fstat(fd).st_size != size:
+            return None
+        return os.read(fd, size)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+def _ensure_plugin(config_path: Path, filename: str, content: bytes) -> Tuple[Path, bool]:
     """
     Ensure the given plugin file exists next to the active config.
 
     Returns (plugin_path, changed_flag).
     """
-    plugin_path = config_path.expanduser().resolve().parent / filename
-    plugin_path.parent.mkdir(parents=True, exist_ok=True)
-
-    existing = None
-    try:
-        existing = plugin_path.read_text(encoding="utf-8")
-    except OSError:
-        existing = None
+    plugin_path = _plugin_dir(config_path) / filename
 
+    existing = _read_bytes_if_size(plugin_path, len(content))
     if existing != content:
-        plugin_path.write_text(content, encoding="utf-8")
+        if not plugin_path.parent.is_dir():
+            plugin_path.parent.mkdir(parents=True, exist_ok=True)
+        _replace_file(plugin_path, content)
         return plugin_path, True
 
     return plugin_path, False
 
 
-_ZSH_PLUGIN_FALLBACK = """# Minimal zsh integration for cli-agent
+_ZSH_PLUGIN_FALLBACK = b"""# Minimal zsh integration for cli-agent
 
 _cli_agent_restore_clear_screen() {
   bindkey '^L' clear-screen 2>/dev/null
@@ -210,7 +281,7 @@ zle -N down-line-or-history _cli_agent_history_down
 _cli_agent_restore_clear_screen
 """
 
-_BASH_PLUGIN_FALLBACK = """# Minimal bash integration for cli-agent
+_BASH_PLUGIN_FALLBACK = b"""# Minimal bash integration for cli-agent
 
 [[ -n "${BASH_VERSION:-}" ]] || return
 
@@ -408,12 +479,34 @@ command_not_found_handle() {
 CLI_AGENT_PLUGIN_LOADED=1
 """
 
-DEFAULT_ZSH_PLUGIN_CONTENT = _load_plugin_content(
-    ROOT / "zsh" / "plugin.zsh", _ZSH_PLUGIN_FALLBACK
-)
-DEFAULT_BASH_PLUGIN_CONTENT = _load_plugin_content(
-    ROOT / "bash" / "plugin.bash", _BASH_PLUGIN_FALLBACK
-)
+@functools.cache
+def _project_root() -> Path:
+    # __file__ is already absolute for imported modules, so no resolve() is needed.
+    return Path(__file__).parent.parent
+
+
+_PLUGIN_SOURCES = {
+    "zsh": ("plugin.zsh", _ZSH_PLUGIN_FALLBACK),
+    "bash": ("plugin.bash", _BASH_PLUGIN_FALLBACK),
+}
+
+
+@functools.cache
+def _plugin_bytes(shell: str) -> bytes:
+    filename, fallback = _PLUGIN_SOURCES[shell]
+    return _load_plugin_bytes(_project_root() / shell / filename, fallback)
+
+
+def ensure_plugin(config_path: Path, shell: str) -> Tuple[Path, bool]:
+    """
+    Ensure the plugin for ``shell`` ("zsh" or "bash") is written next to the active config.
+
+    Returns (plugin_path, changed_flag).
+    """
+    source = _PLUGIN_SOURCES.get(shell)
+    if source is None:
+        raise ValueError(f"Unsupported shell for plugin install: {shell}")
+    return _ensure_plugin(config_path, source[0], _plugin_bytes(shell))
 
 
 def ensure_zsh_plugin(config_path: Path) -> Tuple[Path, bool]:
@@ -422,7 +515,7 @@ def ensure_zsh_plugin(config_path: Path) -> Tuple[Path, bool]:
 
     Returns (plugin_path, changed_flag).
     """
-    return _ensure_plugin(config_path, "plugin.zsh", DEFAULT_ZSH_PLUGIN_CONTENT)
+    return ensure_plugin(config_path, "zsh")
 
 
 def ensure_bash_plugin(config_path: Path) -> Tuple[Path, bool]:
@@ -431,4 +524,4 @@ def ensure_bash_plugin(config_path: Path) -> Tuple[Path, bool]:
 
     Returns (plugin_path, changed_flag).
     """
-    return _ensure_plugin(config_path, "plugin.bash", DEFAULT_BASH_PLUGIN_CONTENT)
+    return ensure_plugin(config_path, "bash")
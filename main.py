@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import argparse
-import asyncio
+import functools
 import sys
 import os
 from pathlib import Path
@@ -10,27 +10,24 @@ import signal
 from agent.config import (
     AppConfig,
     ConfigError,
-    AgentConfig,
     find_config_path,
     initialize_default_config,
     load_app_config,
 )
 from agent.history import HistoryStore
-from agent.loop import run_agent
-from agent.ui import build_console
 from agent.utils import (
     BuiltinCommand,
     ensure_bash_plugin,
     ensure_zsh_plugin,
-    is_reset_command,
     parse_builtin_command,
 )
-from agent.tools import set_active_config_path, set_active_workdir
 
 APP_VERSION = "0.4.2"
+_DEFAULT_CONFIG_PATH = Path("~/.config/cli-agent/config.toml")
 
 
-def parse_args(argv: list[str]) -> argparse.Namespace:
+@functools.cache
+def _get_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="CLI agent backend", add_help=True)
     parser.add_argument("request", nargs="?", help='User request text, e.g. "Summarize README"')
     parser.add_argument(
@@ -47,6 +44,11 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--config", help="Path to config TOML file")
     parser.add_argument("--session", help="Session name (overrides config)")
     parser.add_argument("--version", action="store_true", help="Show version and exit")
+    return parser
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = _get_parser()
     args = parser.parse_args(argv)
     if args.request and args.input:
         parser.error("Provide request as a positional argument or via --input, not both.")
@@ -54,25 +56,18 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
 
 
 def load_config(args: argparse.Namespace) -> AppConfig:
-    cli_path = Path(args.config).expanduser() if args.config else None
-    if cli_path and not cli_path.is_file():
+    cli_path = os.path.expanduser(args.config) if args.config else None
+    if cli_path and not os.path.isfile(cli_path):
         raise ConfigError(f"Config file not found: {cli_path}")
 
-    auto_path = cli_path or find_config_path()
+    auto_path = Path(cli_path) if cli_path else find_config_path()
     if not auto_path:
         auto_path = initialize_default_config(os.getenv("CLI_AGENT_CONFIG"))
         print(f"Initialized default config at {auto_path}", file=sys.stderr)
     config = load_app_config(auto_path)
 
     if args.session:
-        config.agent = AgentConfig(
-            max_steps=config.agent.max_steps,
-            timeout_sec=config.agent.timeout_sec,
-            max_tool_calls_per_step=config.agent.max_tool_calls_per_step,
-            history_dir=config.agent.history_dir,
-            session=args.session,
-            follow_cwd=config.agent.follow_cwd,
-        )
+        config.agent.session = args.session
 
     return config
 
@@ -84,7 +79,7 @@ def handle_reset(history: HistoryStore) -> int:
 
 
 def handle_show_config(config: AppConfig) -> int:
-    cfg_path = (config.path or Path("~/.config/cli-agent/config.toml")).expanduser().resolve()
+    cfg_path = (config.path or _DEFAULT_CONFIG_PATH).expanduser().resolve()
     print(f"Active config: {cfg_path}", file=sys.stderr)
     try:
         content = cfg_path.read_text(encoding="utf-8")
@@ -108,12 +103,17 @@ def handle_show_help() -> int:
     return 0
 
 
+_STATUS: tuple[str, str] = ("", "")
+
+
+def _status_handler(signum, frame) -> None:  # type: ignore[override]
+    model, session = _STATUS
+    print(f"[cli-agent] status: model={model}, session={session}", file=sys.stderr)
+
+
 def _install_status_signals(config: AppConfig) -> None:
-    def _status_handler(signum, frame) -> None:  # type: ignore[override]
-        print(
-            f"[cli-agent] status: model={config.provider.model}, session={config.agent.session}",
-            file=sys.stderr,
-        )
+    global _STATUS
+    _STATUS = (config.provider.model, config.agent.session)
 
     for sig_name in ("SIGUSR1", "SIGINFO"):
         sig = getattr(signal, sig_name, None)
@@ -136,7 +136,7 @@ def main() -> int:
         print(f"Config error: {exc}", file=sys.stderr)
         return 1
 
-    plugin_config_path = config.path or Path("~/.config/cli-agent/config.toml")
+    plugin_config_path = config.path or _DEFAULT_CONFIG_PATH
 
     zsh_plugin_path, zsh_plugin_changed = ensure_zsh_plugin(plugin_config_path)
     if zsh_plugin_changed:
@@ -156,11 +156,7 @@ def main() -> int:
         print(f"cli-agent {APP_VERSION}")
         return 0
 
-    _install_status_signals(config)
-
     history = HistoryStore(config.agent.history_dir, args.session or config.agent.session)
-    set_active_config_path(config.path)
-    set_active_workdir(Path.cwd())
 
     request_text = args.request or args.input
     builtin_command, builtin_payload = parse_builtin_command(request_text)
@@ -177,10 +173,30 @@ def main() -> int:
     if not request_text:
         return 0
 
+    # The agent stack pulls in asyncio, openai and rich; only load it when a request will run.
+    import asyncio
+
+    from agent.loop import run_agent
+    from agent.tools import set_active_config_path, set_active_workdir
+    from agent.ui import build_console
+
+    set_active_config_path(config.path)
+    set_active_workdir(Path.cwd())
     console = build_console(config.ui.rich)
+    _install_status_signals(config)
+
+    run = asyncio.run
+    # uvloop is an optional extra; it does not support Windows and 3.14+ keeps the stdlib loop.
+    if sys.platform != "win32" and sys.version_info < (3, 14):
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            run = uvloop.run
 
     try:
-        result = asyncio.run(
+        result = run(
             run_agent(request_text, config, history, console, builtin_command=builtin_command)
         )
         return result.exit_code
@@ -80,3 +80,20 @@ def test_load_chat_compacts_legacy_json(tmp_path):
         'tool\t"list_dir({\\"path\\": \\"./\\"})"',
         'assistant\t"done"',
     ]
+
+
+def test_history_appends_non_ascii_as_utf8(tmp_path):
+    store = HistoryStore(tmp_path, "demo")
+
+    store.append_chat({"role": "user", "content": "привет"})
+    store.append_nl_command("покажи файлы")
+
+    assert store.load_chat_messages() == [{"role": "user", "content": "привет"}]
+    assert store.nl_path.read_bytes() == "покажи файлы\n".encode("utf-8")
+
+
+def test_load_chat_messages_tolerates_missing_file(tmp_path):
+    store = HistoryStore(tmp_path, "demo")
+    store.chat_path.unlink()
+
+    assert store.load_chat_messages() == []
@@ -12,9 +12,24 @@ from agent.tools import set_active_workdir
 from agent.ui import build_console
 
 
+class FakeClient:
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_client(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(loop_module, "build_client", lambda provider: client)
+    return client
+
+
 @pytest.mark.asyncio
 async def test_loop_runs_tool_and_outputs_add(monkeypatch, capsys, tmp_path):
-    async def fake_complete(messages, tools, provider):
+    async def fake_complete(messages, tools, provider, client):
         # If a tool result is already present, return a final answer.
         if any(m.get("role") == "tool" for m in messages):
             return LLMResponse(
@@ -63,7 +78,7 @@ async def test_loop_runs_tool_and_outputs_add(monkeypatch, capsys, tmp_path):
 async def test_loop_injects_system_and_custom_prompts(monkeypatch, tmp_path):
     seen_messages = []
 
-    async def fake_complete(messages, tools, provider):
+    async def fake_complete(messages, tools, provider, client):
         seen_messages.extend(messages)
         return LLMResponse(message={"role": "assistant", "content": "done"}, finish_reason="stop")
 
@@ -89,7 +104,7 @@ async def test_loop_injects_system_and_custom_prompts(monkeypatch, tmp_path):
 
 @pytest.mark.asyncio
 async def test_loop_hides_step_when_no_tools(monkeypatch, capsys, tmp_path):
-    async def fake_complete(messages, tools, provider):
+    async def fake_complete(messages, tools, provider, client):
         return LLMResponse(message={"role": "assistant", "content": "just text"}, finish_reason="stop")
 
     monkeypatch.setattr(loop_module, "complete_chat", fake_complete)
@@ -115,7 +130,7 @@ async def test_loop_hides_step_when_no_tools(monkeypatch, capsys, tmp_path):
 async def test_loop_handles_reset_without_llm(monkeypatch, tmp_path):
     called = {"llm": False}
 
-    async def fake_complete(messages, tools, provider):
+    async def fake_complete(messages, tools, provider, client):
         called["llm"] = True
         return LLMResponse(message={"role": "assistant", "content": "should not run"}, finish_reason="stop")
 
@@ -140,7 +155,7 @@ async def test_loop_handles_reset_without_llm(monkeypatch, tmp_path):
 
 @pytest.mark.asyncio
 async def test_loop_appends_follow_cwd(monkeypatch, capsys, tmp_path):
-    async def fake_complete(messages, tools, provider):
+    async def fake_complete(messages, tools, provider, client):
         return LLMResponse(message={"role": "assistant", "content": "done"}, finish_reason="stop")
 
     monkeypatch.setattr(loop_module, "complete_chat", fake_complete)
@@ -153,7 +168,7 @@ async def test_loop_appends_follow_cwd(monkeypatch, capsys, tmp_path):
 
 @pytest.mark.asyncio
 async def test_loop_renders_markdown_when_enabled(monkeypatch, tmp_path):
-    async def fake_complete(messages, tools, provider):
+    async def fake_complete(messages, tools, provider, client):
         return LLMResponse(message={"role": "assistant", "content": "Hello\n\n- item"}, finish_reason="stop")
 
     monkeypatch.setattr(loop_module, "complete_chat", fake_complete)
@@ -180,3 +195,40 @@ async def test_loop_renders_markdown_when_enabled(monkeypatch, tmp_path):
     assert console.calls
     printed = console.calls[-1][0][0]
     assert isinstance(printed, Markdown)
+
+
+@pytest.mark.asyncio
+async def test_loop_reuses_and_closes_client(monkeypatch, tmp_path, fake_client):
+    seen_clients = []
+
+    async def fake_complete(messages, tools, provider, client):
+        seen_clients.append(client)
+        if any(m.get("role") == "tool" for m in messages):
+            return LLMResponse(message={"role": "assistant", "content": "done"}, finish_reason="stop")
+        return LLMResponse(
+            message={
+                "role": "assistant",
+                "tool_calls": [{"id": "call-1", "type": "function", "function": {"name": "list_dir", "arguments": "{}"}}],
+            },
+            finish_reason="tool_calls",
+        )
+
+    async def fake_execute_tool_call(tool_call):
+        return "ok"
+
+    monkeypatch.setattr(loop_module, "complete_chat", fake_complete)
+    monkeypatch.setattr(loop_module, "execute_tool_call", fake_execute_tool_call)
+
+    config = AppConfig(
+        provider=ProviderConfig(api_key_env="DUMMY"),
+        agent=AgentConfig(max_steps=3, timeout_sec=2, history_dir=tmp_path, session="demo"),
+        ui=UIConfig(rich=False, show_tool_args=True, show_step_summary=False),
+        tools={},
+    )
+    history = HistoryStore(tmp_path, "demo")
+
+    result = await run_agent("Do something", config, history, build_console(False))
+
+    assert result.exit_code == 0
+    assert seen_clients == [fake_client, fake_client]
+    assert fake_client.closed is True
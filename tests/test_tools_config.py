@@ -1,10 +1,13 @@
 import json
+import os
 import sys
 import tomllib
 
 import pytest
 
 from agent.tools import (
+    _direct_argv,
+    _extract_cd_target,
     execute_tool_call,
     get_active_workdir,
     set_active_config_path,
@@ -122,3 +125,50 @@ async def test_replace_in_file(tmp_path):
     assert get_active_workdir() == child.resolve()
 
     set_active_workdir(None)
+
+
+def test_direct_argv_only_for_plain_commands():
+    if os.name == "nt":
+        assert _direct_argv("git status") is None
+        return
+    assert _direct_argv("git status --short") == ["git", "status", "--short"]
+    assert _direct_argv("ls --color=auto") == ["ls", "--color=auto"]
+    assert _direct_argv("cd child") is None
+    assert _direct_argv("ls | wc -l") is None
+    assert _direct_argv("FOO=1 env") is None
+    assert _direct_argv("ls ~") is None
+    assert _direct_argv("   ") is None
+    # Only spaces and tabs separate words, as in sh.
+    assert _direct_argv("ls\ta  b") == ["ls", "a", "b"]
+    assert _direct_argv("ls a\u00a0b") == ["ls", "a\u00a0b"]
+    assert _direct_argv("ls a\u202fb") == ["ls", "a\u202fb"]
+    assert _direct_argv("ls a\fb\vc") == ["ls", "a\fb\vc"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX shell quoting")
+def test_extract_cd_target_variants():
+    assert _extract_cd_target("cd /tmp") == "/tmp"
+    assert _extract_cd_target("  CD /tmp") == "/tmp"
+    assert _extract_cd_target("\\cd /tmp") == "/tmp"
+    assert _extract_cd_target('c"d" /tmp') == "/tmp"
+    assert _extract_cd_target("'cd' /tmp") == "/tmp"
+    assert _extract_cd_target("ls -la") is None
+    assert _extract_cd_target("echo 'cd /tmp'") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(os.name == "nt", reason="POSIX shell exit codes")
+async def test_run_cmd_missing_program_falls_back_to_shell(tmp_path):
+    set_active_workdir(tmp_path)
+
+    call = {
+        "function": {
+            "name": "run_cmd",
+            "arguments": json.dumps({"cmd": "cli-agent-missing-program --flag"}),
+        }
+    }
+    payload = json.loads(await execute_tool_call(call))
+    assert payload["exit_code"] == 127
+    assert "cli-agent-missing-program" in payload["stderr"]
+
+    set_active_workdir(None)
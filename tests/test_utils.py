@@ -1,15 +1,21 @@
+import os
 from pathlib import Path
 
+import pytest
+
 from agent.utils import (
     BuiltinCommand,
-    DEFAULT_BASH_PLUGIN_CONTENT,
-    DEFAULT_ZSH_PLUGIN_CONTENT,
+    _plugin_bytes,
     ensure_bash_plugin,
+    ensure_plugin,
     ensure_zsh_plugin,
     is_reset_command,
     parse_builtin_command,
 )
 
+ZSH_PLUGIN_CONTENT = _plugin_bytes("zsh").decode("utf-8")
+BASH_PLUGIN_CONTENT = _plugin_bytes("bash").decode("utf-8")
+
 
 def test_is_reset_command_variants():
     assert is_reset_command("reset")
@@ -31,6 +37,15 @@ def test_parse_builtin_command_variants():
     assert parse_builtin_command("unknown") == (None, "")
 
 
+def test_parse_builtin_command_is_case_insensitive():
+    assert parse_builtin_command("  Show_Config ") == (BuiltinCommand.SHOW_CONFIG, "")
+    assert parse_builtin_command("Update Config model=gpt-4o") == (
+        BuiltinCommand.UPDATE_CONFIG,
+        "model=gpt-4o",
+    )
+    assert parse_builtin_command("please reset the session") == (None, "")
+
+
 def test_ensure_zsh_plugin_writes_content(tmp_path):
     cfg = tmp_path / "config.toml"
     cfg.write_text("", encoding="utf-8")
@@ -38,7 +53,7 @@ def test_ensure_zsh_plugin_writes_content(tmp_path):
     plugin_path, changed = ensure_zsh_plugin(cfg)
     assert changed is True
     assert plugin_path.exists()
-    assert plugin_path.read_text(encoding="utf-8") == DEFAULT_ZSH_PLUGIN_CONTENT
+    assert plugin_path.read_text(encoding="utf-8") == ZSH_PLUGIN_CONTENT
 
     # second call is idempotent
     plugin_path, changed_again = ensure_zsh_plugin(cfg)
@@ -52,7 +67,80 @@ def test_ensure_bash_plugin_writes_content(tmp_path):
     plugin_path, changed = ensure_bash_plugin(cfg)
     assert changed is True
     assert plugin_path.exists()
-    assert plugin_path.read_text(encoding="utf-8") == DEFAULT_BASH_PLUGIN_CONTENT
+    assert plugin_path.read_text(encoding="utf-8") == BASH_PLUGIN_CONTENT
 
     plugin_path, changed_again = ensure_bash_plugin(cfg)
     assert changed_again is False
+
+
+def test_ensure_plugin_rewrites_stale_content(tmp_path):
+    cfg = tmp_path / "config.toml"
+    cfg.write_text("", encoding="utf-8")
+    plugin_path, _ = ensure_zsh_plugin(cfg)
+
+    # Same size, different bytes: must still be detected as stale.
+    plugin_path.write_text("#" * len(ZSH_PLUGIN_CONTENT.encode("utf-8")), encoding="utf-8")
+    _, changed = ensure_zsh_plugin(cfg)
+    assert changed is True
+    assert plugin_path.read_text(encoding="utf-8") == ZSH_PLUGIN_CONTENT
+
+    plugin_path.write_text("# truncated\n", encoding="utf-8")
+    _, changed = ensure_zsh_plugin(cfg)
+    assert changed is True
+    assert plugin_path.read_text(encoding="utf-8") == ZSH_PLUGIN_CONTENT
+
+
+def test_ensure_plugin_ignores_leftover_temp_file(tmp_path):
+    cfg = tmp_path / "config.toml"
+    plugin_path = tmp_path / "plugin.zsh"
+    plugin_path.write_text("# old plugin\n", encoding="utf-8")
+    stale_tmp = tmp_path / "plugin.zsh.tmp"
+    stale_tmp.write_text("# left behind by an interrupted run\n", encoding="utf-8")
+
+    _, changed = ensure_zsh_plugin(cfg)
+    assert changed is True
+    assert plugin_path.read_text(encoding="utf-8") == ZSH_PLUGIN_CONTENT
+    assert stale_tmp.read_text(encoding="utf-8") == "# left behind by an interrupted run\n"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["plugin.zsh", "plugin.zsh.tmp"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions and symlinks")
+def test_ensure_plugin_keeps_symlink_and_honours_umask(tmp_path):
+    real_dir = tmp_path / "dotfiles"
+    real_dir.mkdir()
+    real_plugin = real_dir / "plugin.zsh"
+    real_plugin.write_text("# old plugin\n", encoding="utf-8")
+    (tmp_path / "plugin.zsh").symlink_to(real_plugin)
+
+    old_umask = os.umask(0o077)
+    try:
+        _, changed = ensure_zsh_plugin(tmp_path / "config.toml")
+        bash_path, _ = ensure_bash_plugin(tmp_path / "config.toml")
+    finally:
+        os.umask(old_umask)
+
+    assert changed is True
+    assert (tmp_path / "plugin.zsh").is_symlink()
+    assert real_plugin.read_text(encoding="utf-8") == ZSH_PLUGIN_CONTENT
+    assert bash_path.stat().st_mode & 0o777 == 0o600
+
+
+def test_ensure_plugin_creates_missing_config_dir(tmp_path):
+    cfg = tmp_path / "nested" / "config.toml"
+
+    plugin_path, changed = ensure_bash_plugin(cfg)
+    assert changed is True
+    assert plugin_path == (tmp_path / "nested" / "plugin.bash").resolve()
+    assert plugin_path.read_text(encoding="utf-8") == BASH_PLUGIN_CONTENT
+
+
+def test_ensure_plugin_dispatches_by_shell(tmp_path):
+    cfg = tmp_path / "config.toml"
+
+    plugin_path, changed = ensure_plugin(cfg, "zsh")
+    assert changed is True
+    assert plugin_path.name == "plugin.zsh"
+    assert ensure_zsh_plugin(cfg) == (plugin_path, False)
+
+    with pytest.raises(ValueError):
+        ensure_plugin(cfg, "fish")